@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """Console application for managing a rental fleet using SQLite."""
 
+import functools
+import re
 import sqlite3
-from contextlib import closing
-from typing import Any, Iterable, Optional
+import sys
+from contextlib import closing, contextmanager
+from typing import Any, Iterable, Iterator, Optional
 
 DB_NAME = "fleet.db"
+# Bump whenever the DDL in DatabaseManager.create_tables changes.
+SCHEMA_VERSION = 6
 
 
 class DatabaseManager:
@@ -13,11 +18,28 @@ class DatabaseManager:
 
     def __init__(self, db_name: str = DB_NAME) -> None:
         self.db_name = db_name
-        self.conn = sqlite3.connect(self.db_name)
+        # Autocommit mode: sqlite3 never issues implicit BEGINs, so single
+        # statements commit on their own and transaction() controls the rest.
+        self.conn = sqlite3.connect(self.db_name, isolation_level=None, cached_statements=256)
         self.conn.row_factory = sqlite3.Row
+        self.configure()
         self.create_tables()
 
+    def configure(self) -> None:
+        # WAL is not available for in-memory databases.
+        if self.db_name != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-20000")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+
     def create_tables(self) -> None:
+        (version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if version == SCHEMA_VERSION:
+            return
+        self._migrate_invoice_seq()
         with closing(self.conn.cursor()) as cur:
             cur.executescript(
                 """
@@ -70,7 +92,7 @@ class DatabaseManager:
                 );
                 CREATE TABLE IF NOT EXISTS tblCustomerInvoice (
                     InvoiceID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    InvoiceNo TEXT UNIQUE NOT NULL,
+                    InvoiceSeq INTEGER UNIQUE NOT NULL,
                     HireID INTEGER NOT NULL,
                     CustomerID INTEGER NOT NULL,
                     InvoiceDate TEXT NOT NULL,
@@ -89,26 +111,202 @@ class DatabaseManager:
                     FOREIGN KEY (SupplierID) REFERENCES tblSupplier(SupplierID),
                     FOREIGN KEY (HireID) REFERENCES tblHire(HireID)
                 );
+                CREATE VIRTUAL TABLE IF NOT EXISTS tblCustomer_fts USING fts5(
+                    Name, Address, content='tblCustomer', content_rowid='CustomerID'
+                );
+                CREATE TRIGGER IF NOT EXISTS tblCustomer_fts_ai AFTER INSERT ON tblCustomer BEGIN
+                    INSERT INTO tblCustomer_fts (rowid, Name, Address)
+                        VALUES (new.CustomerID, new.Name, new.Address);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tblCustomer_fts_ad AFTER DELETE ON tblCustomer BEGIN
+                    INSERT INTO tblCustomer_fts (tblCustomer_fts, rowid, Name, Address)
+                        VALUES ('delete', old.CustomerID, old.Name, old.Address);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tblCustomer_fts_au AFTER UPDATE ON tblCustomer BEGIN
+                    INSERT INTO tblCustomer_fts (tblCustomer_fts, rowid, Name, Address)
+                        VALUES ('delete', old.CustomerID, old.Name, old.Address);
+                    INSERT INTO tblCustomer_fts (rowid, Name, Address)
+                        VALUES (new.CustomerID, new.Name, new.Address);
+                END;
+                INSERT INTO tblCustomer_fts (tblCustomer_fts) VALUES ('rebuild');
+                CREATE VIRTUAL TABLE IF NOT EXISTS tblSupplier_fts USING fts5(
+                    CompanyName, ContactPerson, content='tblSupplier', content_rowid='SupplierID'
+                );
+                CREATE TRIGGER IF NOT EXISTS tblSupplier_fts_ai AFTER INSERT ON tblSupplier BEGIN
+                    INSERT INTO tblSupplier_fts (rowid, CompanyName, ContactPerson)
+                        VALUES (new.SupplierID, new.CompanyName, new.ContactPerson);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tblSupplier_fts_ad AFTER DELETE ON tblSupplier BEGIN
+                    INSERT INTO tblSupplier_fts (tblSupplier_fts, rowid, CompanyName, ContactPerson)
+                        VALUES ('delete', old.SupplierID, old.CompanyName, old.ContactPerson);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tblSupplier_fts_au AFTER UPDATE ON tblSupplier BEGIN
+                    INSERT INTO tblSupplier_fts (tblSupplier_fts, rowid, CompanyName, ContactPerson)
+                        VALUES ('delete', old.SupplierID, old.CompanyName, old.ContactPerson);
+                    INSERT INTO tblSupplier_fts (rowid, CompanyName, ContactPerson)
+                        VALUES (new.SupplierID, new.CompanyName, new.ContactPerson);
+                END;
+                INSERT INTO tblSupplier_fts (tblSupplier_fts) VALUES ('rebuild');
+                CREATE INDEX IF NOT EXISTS idx_hire_customer ON tblHire(CustomerID);
+                CREATE INDEX IF NOT EXISTS idx_hire_fleet ON tblHire(FleetID);
+                DROP INDEX IF EXISTS idx_hire_status;
+                CREATE INDEX IF NOT EXISTS idx_hire_cover ON tblHire(
+                    Status, HireID, FleetID, HireType, StartDate, EndDate, TotalAmount
+                );
+                CREATE INDEX IF NOT EXISTS idx_inv_customer ON tblCustomerInvoice(CustomerID);
+                CREATE INDEX IF NOT EXISTS idx_inv_hire ON tblCustomerInvoice(HireID);
+                CREATE INDEX IF NOT EXISTS idx_pay_supplier ON tblSupplierPayment(SupplierID);
+                CREATE INDEX IF NOT EXISTS idx_pay_hire ON tblSupplierPayment(HireID);
+                DROP INDEX IF EXISTS idx_supplier_name;
+                CREATE INDEX IF NOT EXISTS idx_fleet_type ON tblFleet(FleetType COLLATE NOCASE);
+                CREATE INDEX IF NOT EXISTS idx_fleet_status ON tblFleet(Status COLLATE NOCASE);
                 """
+                f"PRAGMA user_version = {SCHEMA_VERSION};"
+            )
+        self._report_orphans()
+
+    def _report_orphans(self) -> None:
+        """Warn about rows whose parent was deleted before foreign keys were enforced.
+
+        Such rows are kept as they are; enforcement only applies to new writes.
+        """
+        orphans: dict[str, int] = {}
+        for row in self.conn.execute("PRAGMA foreign_key_check"):
+            orphans[row[0]] = orphans.get(row[0], 0) + 1
+        for table, count in orphans.items():
+            print(
+                f"Warning: {count} row(s) in {table} reference deleted records "
+                "(see PRAGMA foreign_key_check).",
+                file=sys.stderr,
             )
-            self.conn.commit()
+
+    def _migrate_invoice_seq(self) -> None:
+        """Rebuild tblCustomerInvoice from the TEXT InvoiceNo to the integer InvoiceSeq."""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(tblCustomerInvoice)")}
+        if "InvoiceNo" not in columns:
+            return
+        seq = "CAST(substr(InvoiceNo, instr(InvoiceNo, '-') + 1) AS INTEGER)"
+        (bad,) = self.conn.execute(
+            f"""SELECT GROUP_CONCAT(InvoiceNo, ', ') FROM tblCustomerInvoice
+                WHERE {seq} <= 0
+                   OR {seq} IN (SELECT {seq} FROM tblCustomerInvoice GROUP BY 1 HAVING COUNT(*) > 1)"""
+        ).fetchone()
+        if bad:
+            raise RuntimeError(
+                "Cannot migrate tblCustomerInvoice: these InvoiceNo values do not map to "
+                f"unique positive invoice numbers: {bad}. Fix them and restart."
+            )
+        # SQLite's table-rebuild procedure: foreign keys must be off while the
+        # table is copied and swapped, or rows that older versions left without
+        # a parent (e.g. invoices of deleted customers) abort the copy.
+        self.conn.execute("PRAGMA foreign_keys=OFF")
+        try:
+            self.conn.executescript(
+                f"""
+                BEGIN IMMEDIATE;
+                CREATE TABLE tblCustomerInvoice_new (
+                    InvoiceID INTEGER PRIMARY KEY AUTOINCREMENT,
+                    InvoiceSeq INTEGER UNIQUE NOT NULL,
+                    HireID INTEGER NOT NULL,
+                    CustomerID INTEGER NOT NULL,
+                    InvoiceDate TEXT NOT NULL,
+                    Amount REAL NOT NULL,
+                    PaymentStatus TEXT DEFAULT 'Unpaid',
+                    FOREIGN KEY (HireID) REFERENCES tblHire(HireID),
+                    FOREIGN KEY (CustomerID) REFERENCES tblCustomer(CustomerID)
+                );
+                INSERT INTO tblCustomerInvoice_new
+                    (InvoiceID, InvoiceSeq, HireID, CustomerID, InvoiceDate, Amount, PaymentStatus)
+                    SELECT InvoiceID, {seq}, HireID, CustomerID, InvoiceDate, Amount, PaymentStatus
+                    FROM tblCustomerInvoice;
+                DROP TABLE tblCustomerInvoice;
+                ALTER TABLE tblCustomerInvoice_new RENAME TO tblCustomerInvoice;
+                DROP TABLE IF EXISTS tblSequence;
+                COMMIT;
+                """
+            )
+        except BaseException:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            raise
+        finally:
+            self.conn.execute("PRAGMA foreign_keys=ON")
 
     def execute(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
+        """Run one statement.
+
+        Outside ``transaction()`` it commits on its own (autocommit mode);
+        inside, it becomes part of the enclosing transaction.
+        """
         cur = self.conn.cursor()
         cur.execute(sql, tuple(params))
-        self.conn.commit()
         return cur
 
+    def executemany(self, sql: str, seq_of_params: Iterable[Iterable[Any]]) -> sqlite3.Cursor:
+        # Without a transaction every row would commit on its own.
+        with self.transaction():
+            cur = self.conn.cursor()
+            cur.executemany(sql, (tuple(params) for params in seq_of_params))
+        return cur
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run the enclosed statements in one write transaction.
+
+        Nested blocks join the outermost transaction instead of starting their own.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+
     def query(self, sql: str, params: Iterable[Any] = ()) -> list[sqlite3.Row]:
         cur = self.conn.cursor()
         cur.execute(sql, tuple(params))
         return cur.fetchall()
 
+    def iter_query(
+        self, sql: str, params: Iterable[Any] = (), arraysize: int = 200
+    ) -> Iterator[dict[str, Any]]:
+        """Yield rows as dicts, fetched in batches of ``arraysize``.
+
+        Column names are read from the cursor description once per query
+        instead of being looked up on every ``sqlite3.Row``.
+        """
+        cur = self.conn.cursor()
+        cur.row_factory = None
+        cur.arraysize = arraysize
+        cur.execute(sql, tuple(params))
+        keys = [d[0] for d in cur.description]
+        with closing(cur):
+            for row in self._iter_batches(cur):
+                yield dict(zip(keys, row))
+
+    @staticmethod
+    def _iter_batches(cur: sqlite3.Cursor) -> Iterator[Any]:
+        while True:
+            rows = cur.fetchmany()
+            if not rows:
+                break
+            yield from rows
+
     def close(self) -> None:
         self.conn.close()
 
 
-db = DatabaseManager()
+@functools.cache
+def get_database(db_name: str = DB_NAME) -> DatabaseManager:
+    """Return the process-wide DatabaseManager for ``db_name``."""
+    return DatabaseManager(db_name)
+
+
+db = get_database()
 
 
 # ----------------------------- Helper utilities -----------------------------
@@ -120,42 +318,122 @@ def prompt(message: str, default: Optional[str] = None) -> str:
     return value.strip()
 
 
+# Validate numeric input up front so bad entries never raise ValueError.
+_INT_RE = re.compile(r"[-+]?\d+")
+_FLOAT_RE = re.compile(r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?")
+
+
 def prompt_float(message: str, default: Optional[float] = None) -> float:
     while True:
         value = prompt(message, str(default) if default is not None else None)
-        try:
+        if _FLOAT_RE.fullmatch(value):
             return float(value)
-        except (TypeError, ValueError):
-            print("Please enter a valid number.")
+        print("Please enter a valid number.")
 
 
 def prompt_int(message: str, default: Optional[int] = None) -> int:
     while True:
         value = prompt(message, str(default) if default is not None else None)
-        try:
+        if _INT_RE.fullmatch(value):
             return int(value)
-        except (TypeError, ValueError):
-            print("Please enter a valid integer.")
+        print("Please enter a valid integer.")
+
+
+# Fixed SQL text per lookup so repeated calls hit sqlite3's statement cache.
+_PRIMARY_KEYS = (
+    ("tblFleet", "FleetID"),
+    ("tblDriver", "DriverID"),
+    ("tblSupplier", "SupplierID"),
+    ("tblCustomer", "CustomerID"),
+    ("tblHire", "HireID"),
+    ("tblCustomerInvoice", "InvoiceID"),
+    ("tblSupplierPayment", "PaymentID"),
+)
+_RECORD_EXISTS_SQL = {
+    (table, key): f"SELECT 1 FROM {table} WHERE {key} = ?" for table, key in _PRIMARY_KEYS
+}
+_CHOOSE_SQL = {
+    (table, key, label): f"SELECT {key}, {label} FROM {table} ORDER BY {key} LIMIT ? OFFSET ?"
+    for table, key, label in (
+        ("tblDriver", "DriverID", "Name"),
+        ("tblSupplier", "SupplierID", "CompanyName"),
+        ("tblCustomer", "CustomerID", "Name"),
+    )
+}
+
+
+def fts_prefix_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Returns None when ``text`` has no words, since FTS5 rejects empty queries.
+    """
+    terms = ['"{}"*'.format(word.replace('"', '""')) for word in text.split()]
+    return " ".join(terms) or None
+
+
+def like_pattern(value: str, contains: bool = False) -> str:
+    """Escape LIKE wildcards in ``value`` for use with ``ESCAPE '\\'``.
+
+    Prefix patterns (the default) let SQLite use a NOCASE index range scan.
+    """
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%" if contains else f"{escaped}%"
+
+
+def prompt_contains() -> bool:
+    mode = prompt("Match (P)refix or (C)ontains", "P")
+    return mode.upper().startswith("C")
 
 
 def record_exists(table: str, key_field: str, value: Any) -> bool:
-    rows = db.query(f"SELECT 1 FROM {table} WHERE {key_field} = ?", (value,))
+    rows = db.query(_RECORD_EXISTS_SQL[(table, key_field)], (value,))
     return bool(rows)
 
 
-def choose_from_table(table: str, id_field: str, label_field: str) -> Optional[int]:
-    rows = db.query(f"SELECT {id_field}, {label_field} FROM {table}")
-    if not rows:
-        print("No records found.")
-        return None
-    for row in rows:
-        print(f"{row[id_field]} - {row[label_field]}")
+def choose_from_table(
+    table: str, id_field: str, label_field: str, limit: int = 50, validate: bool = True
+) -> Optional[int]:
+    """List ``table`` page by page and return the ID the user enters.
+
+    Pass ``validate=False`` when the caller checks the ID itself.
+    """
+    sql = _CHOOSE_SQL[(table, id_field, label_field)]
+    offset = 0
+    while True:
+        # Fetch one extra row to learn whether a next page exists.
+        rows = db.query(sql, (limit + 1, offset))
+        if not rows:
+            print("No records found.")
+            return None
+        has_next = len(rows) > limit
+        sys.stdout.write("\n".join(f"{row[0]} - {row[1]}" for row in rows[:limit]) + "\n")
+        paging = []
+        if has_next:
+            paging.append("n=next")
+        if offset:
+            paging.append("p=previous")
+        hint = f" ({', '.join(paging)})" if paging else ""
+        while True:
+            value = input(f"Enter {id_field}{hint}: ").strip().lower()
+            # Paging past either end re-prompts on the same page.
+            if value == "n" and not has_next:
+                print("Already on the last page.")
+            elif value == "p" and not offset:
+                print("Already on the first page.")
+            else:
+                break
+        if value == "n":
+            offset += limit
+        elif value == "p":
+            offset = max(offset - limit, 0)
+        else:
+            break
     try:
-        choice = int(input(f"Enter {id_field}: "))
+        choice = int(value)
     except ValueError:
         print("Invalid choice.")
         return None
-    if not record_exists(table, id_field, choice):
+    if validate and not record_exists(table, id_field, choice):
         print("ID does not exist.")
         return None
     return choice
@@ -166,25 +444,33 @@ def choose_from_table(table: str, id_field: str, label_field: str) -> Optional[i
 def add_fleet() -> None:
     print("\nAdd Fleet")
     fleet_id = prompt("Fleet ID")
-    if record_exists("tblFleet", "FleetID", fleet_id):
-        print("Fleet ID already exists.")
-        return
     serial = prompt("Serial No")
     fleet_type = prompt("Fleet Type")
     ownership = prompt("Ownership (Owned/Rented-in)")
     capacity = prompt_float("Capacity")
     status = prompt("Status")
-    db.execute(
-        """INSERT INTO tblFleet (FleetID, SerialNo, FleetType, Ownership, Capacity, Status)
-            VALUES (?, ?, ?, ?, ?, ?)""",
-        (fleet_id, serial, fleet_type, ownership, capacity, status),
-    )
+    # The primary key rejects duplicates, so the existence check only runs on failure.
+    try:
+        db.execute(
+            """INSERT OR ABORT INTO tblFleet (FleetID, SerialNo, FleetType, Ownership, Capacity, Status)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+            (fleet_id, serial, fleet_type, ownership, capacity, status),
+        )
+    except sqlite3.IntegrityError as exc:
+        if record_exists("tblFleet", "FleetID", fleet_id):
+            print("Fleet ID already exists.")
+        else:
+            print("Could not add fleet:", exc)
+        return
     print("Fleet added successfully.")
 
 
 def update_fleet() -> None:
     fleet_id = prompt("Enter Fleet ID to update")
-    rows = db.query("SELECT * FROM tblFleet WHERE FleetID = ?", (fleet_id,))
+    rows = db.query(
+        "SELECT SerialNo, FleetType, Ownership, Capacity, Status FROM tblFleet WHERE FleetID = ?",
+        (fleet_id,),
+    )
     if not rows:
         print("Fleet not found.")
         return
@@ -208,42 +494,64 @@ def delete_fleet() -> None:
     if confirm.upper() != "YES":
         print("Deletion cancelled.")
         return
-    db.execute("DELETE FROM tblFleet WHERE FleetID = ?", (fleet_id,))
+    try:
+        db.execute("DELETE FROM tblFleet WHERE FleetID = ?", (fleet_id,))
+    except sqlite3.IntegrityError:
+        print("Cannot delete: record is referenced by other records.")
+        return
     print("Fleet deleted (if existed).")
 
 
 def list_fleet() -> None:
-    rows = db.query("SELECT * FROM tblFleet ORDER BY FleetID")
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    found = False
+    for row in db.iter_query("SELECT * FROM tblFleet ORDER BY FleetID"):
+        found = True
+        print(row)
+    if not found:
         print("No fleet records.")
 
 
+_FLEET_SEARCH_SQL = {
+    "fleettype": "SELECT * FROM tblFleet WHERE FleetType LIKE ? ESCAPE '\\'",
+    "ownership": "SELECT * FROM tblFleet WHERE Ownership LIKE ? ESCAPE '\\'",
+    "status": "SELECT * FROM tblFleet WHERE Status LIKE ? ESCAPE '\\'",
+}
+
+
 def search_fleet() -> None:
     field = prompt("Search by (FleetType/Ownership/Status)")
+    # Column names are case-insensitive in SQL, so accept any casing here too.
+    sql = _FLEET_SEARCH_SQL.get(field.lower())
+    if sql is None:
+        print("Invalid field.")
+        return
+    contains = prompt_contains()
     value = prompt("Enter search value")
-    rows = db.query(f"SELECT * FROM tblFleet WHERE {field} LIKE ?", (f"%{value}%",))
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    found = False
+    for row in db.iter_query(sql, (like_pattern(value, contains),)):
+        found = True
+        print(row)
+    if not found:
         print("No matches.")
 
 
+_FLEET_MENU_PROMPT = "\nFleet Menu\n1. Add Fleet\n2. Update Fleet\n3. Delete Fleet\n4. List Fleet\n5. Search Fleet\n0. Back\n"
+_FLEET_MENU_OPTIONS = {
+    "1": add_fleet,
+    "2": update_fleet,
+    "3": delete_fleet,
+    "4": list_fleet,
+    "5": search_fleet,
+}
+
+
 def fleet_menu() -> None:
-    options = {
-        "1": add_fleet,
-        "2": update_fleet,
-        "3": delete_fleet,
-        "4": list_fleet,
-        "5": search_fleet,
-    }
     while True:
-        print("""\nFleet Menu\n1. Add Fleet\n2. Update Fleet\n3. Delete Fleet\n4. List Fleet\n5. Search Fleet\n0. Back""")
+        sys.stdout.write(_FLEET_MENU_PROMPT)
         choice = input("Choose: ")
         if choice == "0":
             break
-        func = options.get(choice)
+        func = _FLEET_MENU_OPTIONS.get(choice)
         if func:
             func()
         else:
@@ -266,7 +574,10 @@ def add_driver() -> None:
 
 def update_driver() -> None:
     driver_id = prompt_int("Driver ID")
-    rows = db.query("SELECT * FROM tblDriver WHERE DriverID = ?", (driver_id,))
+    rows = db.query(
+        "SELECT Name, PhoneNo, Status, Notes FROM tblDriver WHERE DriverID = ?",
+        (driver_id,),
+    )
     if not rows:
         print("Driver not found.")
         return
@@ -288,41 +599,50 @@ def delete_driver() -> None:
     if confirm.upper() != "YES":
         print("Cancelled.")
         return
-    db.execute("DELETE FROM tblDriver WHERE DriverID=?", (driver_id,))
+    try:
+        db.execute("DELETE FROM tblDriver WHERE DriverID=?", (driver_id,))
+    except sqlite3.IntegrityError:
+        print("Cannot delete: record is referenced by other records.")
+        return
     print("Driver deleted (if existed).")
 
 
 def list_drivers() -> None:
-    rows = db.query("SELECT * FROM tblDriver ORDER BY DriverID")
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    found = False
+    for row in db.iter_query("SELECT * FROM tblDriver ORDER BY DriverID"):
+        found = True
+        print(row)
+    if not found:
         print("No driver records.")
 
 
 def search_drivers() -> None:
     status = prompt("Filter by Status")
-    rows = db.query("SELECT * FROM tblDriver WHERE Status LIKE ?", (f"%{status}%",))
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    found = False
+    for row in db.iter_query("SELECT * FROM tblDriver WHERE Status LIKE ?", (f"%{status}%",)):
+        found = True
+        print(row)
+    if not found:
         print("No matches.")
 
 
+_DRIVER_MENU_PROMPT = "\nDriver Menu\n1. Add Driver\n2. Update Driver\n3. Delete Driver\n4. List Drivers\n5. Search Drivers\n0. Back\n"
+_DRIVER_MENU_OPTIONS = {
+    "1": add_driver,
+    "2": update_driver,
+    "3": delete_driver,
+    "4": list_drivers,
+    "5": search_drivers,
+}
+
+
 def driver_menu() -> None:
-    options = {
-        "1": add_driver,
-        "2": update_driver,
-        "3": delete_driver,
-        "4": list_drivers,
-        "5": search_drivers,
-    }
     while True:
-        print("""\nDriver Menu\n1. Add Driver\n2. Update Driver\n3. Delete Driver\n4. List Drivers\n5. Search Drivers\n0. Back""")
+        sys.stdout.write(_DRIVER_MENU_PROMPT)
         choice = input("Choose: ")
         if choice == "0":
             break
-        func = options.get(choice)
+        func = _DRIVER_MENU_OPTIONS.get(choice)
         if func:
             func()
         else:
@@ -345,7 +665,10 @@ def add_supplier() -> None:
 
 def update_supplier() -> None:
     supplier_id = prompt_int("Supplier ID")
-    rows = db.query("SELECT * FROM tblSupplier WHERE SupplierID=?", (supplier_id,))
+    rows = db.query(
+        "SELECT CompanyName, ContactPerson, PhoneNo, Email FROM tblSupplier WHERE SupplierID=?",
+        (supplier_id,),
+    )
     if not rows:
         print("Supplier not found.")
         return
@@ -368,41 +691,63 @@ def delete_supplier() -> None:
     if confirm.upper() != "YES":
         print("Cancelled.")
         return
-    db.execute("DELETE FROM tblSupplier WHERE SupplierID=?", (supplier_id,))
+    try:
+        db.execute("DELETE FROM tblSupplier WHERE SupplierID=?", (supplier_id,))
+    except sqlite3.IntegrityError:
+        print("Cannot delete: record is referenced by other records.")
+        return
     print("Supplier deleted (if existed).")
 
 
 def list_suppliers() -> None:
-    rows = db.query("SELECT * FROM tblSupplier ORDER BY SupplierID")
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    found = False
+    for row in db.iter_query("SELECT * FROM tblSupplier ORDER BY SupplierID"):
+        found = True
+        print(row)
+    if not found:
         print("No supplier records.")
 
 
 def search_suppliers() -> None:
+    contains = prompt_contains()
     name = prompt("Search company")
-    rows = db.query("SELECT * FROM tblSupplier WHERE CompanyName LIKE ?", (f"%{name}%",))
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    match = fts_prefix_query(name)
+    if contains:
+        # Substring matches cannot use the full-text index.
+        sql = "SELECT * FROM tblSupplier WHERE CompanyName LIKE ? ESCAPE '\\' ORDER BY SupplierID"
+        params = (like_pattern(name, contains=True),)
+    elif match is None:
+        sql, params = "SELECT * FROM tblSupplier ORDER BY SupplierID", ()
+    else:
+        sql = """SELECT s.* FROM tblSupplier s
+                    JOIN tblSupplier_fts f ON f.rowid = s.SupplierID
+                    WHERE f.CompanyName MATCH ? ORDER BY s.SupplierID"""
+        params = (match,)
+    found = False
+    for row in db.iter_query(sql, params):
+        found = True
+        print(row)
+    if not found:
         print("No matches.")
 
 
+_SUPPLIER_MENU_PROMPT = "\nSupplier Menu\n1. Add Supplier\n2. Update Supplier\n3. Delete Supplier\n4. List Suppliers\n5. Search Suppliers\n0. Back\n"
+_SUPPLIER_MENU_OPTIONS = {
+    "1": add_supplier,
+    "2": update_supplier,
+    "3": delete_supplier,
+    "4": list_suppliers,
+    "5": search_suppliers,
+}
+
+
 def supplier_menu() -> None:
-    options = {
-        "1": add_supplier,
-        "2": update_supplier,
-        "3": delete_supplier,
-        "4": list_suppliers,
-        "5": search_suppliers,
-    }
     while True:
-        print("""\nSupplier Menu\n1. Add Supplier\n2. Update Supplier\n3. Delete Supplier\n4. List Suppliers\n5. Search Suppliers\n0. Back""")
+        sys.stdout.write(_SUPPLIER_MENU_PROMPT)
         choice = input("Choose: ")
         if choice == "0":
             break
-        func = options.get(choice)
+        func = _SUPPLIER_MENU_OPTIONS.get(choice)
         if func:
             func()
         else:
@@ -425,7 +770,10 @@ def add_customer() -> None:
 
 def update_customer() -> None:
     customer_id = prompt_int("Customer ID")
-    rows = db.query("SELECT * FROM tblCustomer WHERE CustomerID=?", (customer_id,))
+    rows = db.query(
+        "SELECT Name, PhoneNo, Email, Address FROM tblCustomer WHERE CustomerID=?",
+        (customer_id,),
+    )
     if not rows:
         print("Customer not found.")
         return
@@ -447,41 +795,63 @@ def delete_customer() -> None:
     if confirm.upper() != "YES":
         print("Cancelled.")
         return
-    db.execute("DELETE FROM tblCustomer WHERE CustomerID=?", (customer_id,))
+    try:
+        db.execute("DELETE FROM tblCustomer WHERE CustomerID=?", (customer_id,))
+    except sqlite3.IntegrityError:
+        print("Cannot delete: record is referenced by other records.")
+        return
     print("Customer deleted (if existed).")
 
 
 def list_customers() -> None:
-    rows = db.query("SELECT * FROM tblCustomer ORDER BY CustomerID")
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    found = False
+    for row in db.iter_query("SELECT * FROM tblCustomer ORDER BY CustomerID"):
+        found = True
+        print(row)
+    if not found:
         print("No customer records.")
 
 
 def search_customers() -> None:
+    contains = prompt_contains()
     name = prompt("Search name")
-    rows = db.query("SELECT * FROM tblCustomer WHERE Name LIKE ?", (f"%{name}%",))
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    match = fts_prefix_query(name)
+    if contains:
+        # Substring matches cannot use the full-text index.
+        sql = "SELECT * FROM tblCustomer WHERE Name LIKE ? ESCAPE '\\' ORDER BY CustomerID"
+        params = (like_pattern(name, contains=True),)
+    elif match is None:
+        sql, params = "SELECT * FROM tblCustomer ORDER BY CustomerID", ()
+    else:
+        sql = """SELECT c.* FROM tblCustomer c
+                    JOIN tblCustomer_fts f ON f.rowid = c.CustomerID
+                    WHERE f.Name MATCH ? ORDER BY c.CustomerID"""
+        params = (match,)
+    found = False
+    for row in db.iter_query(sql, params):
+        found = True
+        print(row)
+    if not found:
         print("No matches.")
 
 
+_CUSTOMER_MENU_PROMPT = "\nCustomer Menu\n1. Add Customer\n2. Update Customer\n3. Delete Customer\n4. List Customers\n5. Search Customers\n0. Back\n"
+_CUSTOMER_MENU_OPTIONS = {
+    "1": add_customer,
+    "2": update_customer,
+    "3": delete_customer,
+    "4": list_customers,
+    "5": search_customers,
+}
+
+
 def customer_menu() -> None:
-    options = {
-        "1": add_customer,
-        "2": update_customer,
-        "3": delete_customer,
-        "4": list_customers,
-        "5": search_customers,
-    }
     while True:
-        print("""\nCustomer Menu\n1. Add Customer\n2. Update Customer\n3. Delete Customer\n4. List Customers\n5. Search Customers\n0. Back""")
+        sys.stdout.write(_CUSTOMER_MENU_PROMPT)
         choice = input("Choose: ")
         if choice == "0":
             break
-        func = options.get(choice)
+        func = _CUSTOMER_MENU_OPTIONS.get(choice)
         if func:
             func()
         else:
@@ -490,22 +860,27 @@ def customer_menu() -> None:
 
 # ----------------------------- Hire module -----------------------------
 
+_HIRE_REFS_SQL = """SELECT EXISTS(SELECT 1 FROM tblDriver WHERE DriverID = ?) AS DriverExists,
+           EXISTS(SELECT 1 FROM tblCustomer WHERE CustomerID = ?) AS CustomerExists,
+           EXISTS(SELECT 1 FROM tblSupplier WHERE SupplierID = ?) AS SupplierExists"""
+
+
 def add_hire() -> None:
     fleet_id = prompt("Fleet ID")
-    if not record_exists("tblFleet", "FleetID", fleet_id):
+    ownership_row = db.query("SELECT Ownership FROM tblFleet WHERE FleetID=?", (fleet_id,))
+    if not ownership_row:
         print("Fleet not found.")
         return
-    driver_id = choose_from_table("tblDriver", "DriverID", "Name")
+    driver_id = choose_from_table("tblDriver", "DriverID", "Name", validate=False)
     if driver_id is None:
         return
-    customer_id = choose_from_table("tblCustomer", "CustomerID", "Name")
+    customer_id = choose_from_table("tblCustomer", "CustomerID", "Name", validate=False)
     if customer_id is None:
         return
-    ownership_row = db.query("SELECT Ownership FROM tblFleet WHERE FleetID=?", (fleet_id,))
-    require_supplier = ownership_row and ownership_row[0]["Ownership"] == "Rented-in"
     supplier_id: Optional[int] = None
-    if require_supplier:
-        supplier_id = choose_from_table("tblSupplier", "SupplierID", "CompanyName")
+    if ownership_row[0]["Ownership"] == "Rented-in":
+        print("Fleet is Rented-in; choose its supplier.")
+        supplier_id = choose_from_table("tblSupplier", "SupplierID", "CompanyName", validate=False)
         if supplier_id is None:
             return
     else:
@@ -517,6 +892,18 @@ def add_hire() -> None:
                 print("Invalid supplier ID.")
                 return
 
+    # Check the picked driver, customer and supplier in a single round trip.
+    refs = db.query(_HIRE_REFS_SQL, (driver_id, customer_id, supplier_id))[0]
+    if not refs["DriverExists"]:
+        print("Driver not found.")
+        return
+    if not refs["CustomerExists"]:
+        print("Customer not found.")
+        return
+    if supplier_id is not None and not refs["SupplierExists"]:
+        print("Supplier not found.")
+        return
+
     hire_type = prompt("Hire Type (Daily/Weekly/Monthly/Trip)")
     start_date = prompt("Start Date (YYYY-MM-DD)")
     end_date = prompt("End Date (YYYY-MM-DD or blank)", "")
@@ -524,13 +911,17 @@ def add_hire() -> None:
     quantity = prompt_int("Quantity", 1)
     total = rate * quantity
     status = "Open"
-    db.execute(
-        """INSERT INTO tblHire (FleetID, DriverID, CustomerID, SupplierID, HireType, StartDate,
-            EndDate, Rate, Quantity, TotalAmount, Status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (fleet_id, driver_id, customer_id, supplier_id, hire_type, start_date, end_date or None,
-         rate, quantity, total, status),
-    )
+    try:
+        db.execute(
+            """INSERT INTO tblHire (FleetID, DriverID, CustomerID, SupplierID, HireType, StartDate,
+                EndDate, Rate, Quantity, TotalAmount, Status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (fleet_id, driver_id, customer_id, supplier_id, hire_type, start_date, end_date or None,
+             rate, quantity, total, status),
+        )
+    except sqlite3.IntegrityError as exc:
+        print("Could not create hire:", exc)
+        return
     print("Hire created with total amount", total)
 
 
@@ -545,45 +936,50 @@ def update_hire_status() -> None:
 
 
 def list_hires() -> None:
-    rows = db.query(
+    found = False
+    for row in db.iter_query(
         """SELECT h.HireID, h.FleetID, c.Name AS Customer, h.HireType, h.StartDate,
                    h.EndDate, h.TotalAmount, h.Status
             FROM tblHire h
             JOIN tblCustomer c ON h.CustomerID = c.CustomerID
             ORDER BY h.HireID"""
-    )
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    ):
+        found = True
+        print(row)
+    if not found:
         print("No hires found.")
 
 
 def search_hires() -> None:
     status = prompt("Filter by Status")
-    rows = db.query(
+    found = False
+    for row in db.iter_query(
         """SELECT HireID, FleetID, HireType, StartDate, EndDate, TotalAmount, Status
             FROM tblHire WHERE Status LIKE ?""",
         (f"%{status}%",),
-    )
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    ):
+        found = True
+        print(row)
+    if not found:
         print("No matches.")
 
 
+_HIRE_MENU_PROMPT = "\nHire Menu\n1. Add Hire\n2. Update Hire Status\n3. List Hires\n4. Search Hires\n0. Back\n"
+_HIRE_MENU_OPTIONS = {
+    "1": add_hire,
+    "2": update_hire_status,
+    "3": list_hires,
+    "4": search_hires,
+}
+
+
 def hire_menu() -> None:
-    options = {
-        "1": add_hire,
-        "2": update_hire_status,
-        "3": list_hires,
-        "4": search_hires,
-    }
     while True:
-        print("""\nHire Menu\n1. Add Hire\n2. Update Hire Status\n3. List Hires\n4. Search Hires\n0. Back""")
+        sys.stdout.write(_HIRE_MENU_PROMPT)
         choice = input("Choose: ")
         if choice == "0":
             break
-        func = options.get(choice)
+        func = _HIRE_MENU_OPTIONS.get(choice)
         if func:
             func()
         else:
@@ -592,15 +988,17 @@ def hire_menu() -> None:
 
 # ----------------------------- Invoice module -----------------------------
 
-def generate_invoice_no() -> str:
-    rows = db.query("SELECT InvoiceNo FROM tblCustomerInvoice ORDER BY InvoiceID DESC LIMIT 1")
-    if not rows:
-        return "INV-0001"
-    last = rows[0]["InvoiceNo"]
-    try:
-        number = int(last.split("-")[-1]) + 1
-    except ValueError:
-        number = 1
+def next_invoice_seq() -> int:
+    """Return the next unused InvoiceSeq (MAX + 1, read through the unique index).
+
+    Call it inside ``db.transaction()`` with the insert that uses the number;
+    the BEGIN IMMEDIATE write lock keeps other writers from reading the same value.
+    """
+    rows = db.query("SELECT IFNULL(MAX(InvoiceSeq), 0) + 1 FROM tblCustomerInvoice")
+    return rows[0][0]
+
+
+def format_invoice_no(number: int) -> str:
     return f"INV-{number:04d}"
 
 
@@ -616,14 +1014,43 @@ def create_invoice_from_hire() -> None:
     if not selected:
         print("Invalid Hire ID.")
         return
-    invoice_no = generate_invoice_no()
     invoice_date = prompt("Invoice Date (YYYY-MM-DD)")
-    db.execute(
-        """INSERT INTO tblCustomerInvoice (InvoiceNo, HireID, CustomerID, InvoiceDate, Amount, PaymentStatus)
-            VALUES (?, ?, ?, ?, ?, 'Unpaid')""",
-        (invoice_no, hire_id, selected["CustomerID"], invoice_date, selected["TotalAmount"]),
+    with db.transaction():
+        invoice_seq = next_invoice_seq()
+        db.execute(
+            """INSERT INTO tblCustomerInvoice (InvoiceSeq, HireID, CustomerID, InvoiceDate, Amount, PaymentStatus)
+                VALUES (?, ?, ?, ?, ?, 'Unpaid')""",
+            (invoice_seq, hire_id, selected["CustomerID"], invoice_date, selected["TotalAmount"]),
+        )
+    print("Invoice created with number", format_invoice_no(invoice_seq))
+
+
+def create_invoices_bulk() -> None:
+    hires = db.query(
+        """SELECT HireID, CustomerID, TotalAmount FROM tblHire
+            WHERE Status='Completed'
+              AND HireID NOT IN (SELECT HireID FROM tblCustomerInvoice)
+            ORDER BY HireID"""
+    )
+    if not hires:
+        print("No uninvoiced completed hires.")
+        return
+    invoice_date = prompt("Invoice Date (YYYY-MM-DD)")
+    with db.transaction():
+        first = next_invoice_seq()
+        rows = [
+            (first + i, h["HireID"], h["CustomerID"], invoice_date, h["TotalAmount"])
+            for i, h in enumerate(hires)
+        ]
+        db.executemany(
+            """INSERT INTO tblCustomerInvoice (InvoiceSeq, HireID, CustomerID, InvoiceDate, Amount, PaymentStatus)
+                VALUES (?, ?, ?, ?, ?, 'Unpaid')""",
+            rows,
+        )
+    print(
+        f"Created {len(rows)} invoices "
+        f"({format_invoice_no(rows[0][0])} to {format_invoice_no(rows[-1][0])})."
     )
-    print("Invoice created with number", invoice_no)
 
 
 def update_invoice_status() -> None:
@@ -637,49 +1064,58 @@ def update_invoice_status() -> None:
 
 
 def list_invoices() -> None:
-    rows = db.query(
-        """SELECT i.InvoiceID, i.InvoiceNo, c.Name AS Customer, i.Amount, i.PaymentStatus
+    found = False
+    for row in db.iter_query(
+        """SELECT i.InvoiceID, printf('INV-%04d', i.InvoiceSeq) AS InvoiceNo, c.Name AS Customer,
+                   i.Amount, i.PaymentStatus
             FROM tblCustomerInvoice i
             JOIN tblCustomer c ON i.CustomerID = c.CustomerID"""
-    )
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    ):
+        found = True
+        print(row)
+    if not found:
         print("No invoices found.")
 
 
 def search_invoices() -> None:
     status = prompt("Filter by Payment Status (leave blank for all)", "")
     customer = prompt("Filter by Customer Name (leave blank for all)", "")
-    query = """SELECT i.InvoiceID, i.InvoiceNo, c.Name, i.Amount, i.PaymentStatus
+    query = """SELECT i.InvoiceID, printf('INV-%04d', i.InvoiceSeq) AS InvoiceNo, c.Name, i.Amount,
+                      i.PaymentStatus
                FROM tblCustomerInvoice i JOIN tblCustomer c ON i.CustomerID=c.CustomerID WHERE 1=1"""
     params: list[Any] = []
     if status:
         query += " AND i.PaymentStatus LIKE ?"
         params.append(f"%{status}%")
-    if customer:
-        query += " AND c.Name LIKE ?"
-        params.append(f"%{customer}%")
-    rows = db.query(query, params)
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    customer_match = fts_prefix_query(customer)
+    if customer_match:
+        query += " AND i.CustomerID IN (SELECT rowid FROM tblCustomer_fts WHERE Name MATCH ?)"
+        params.append(customer_match)
+    found = False
+    for row in db.iter_query(query, params):
+        found = True
+        print(row)
+    if not found:
         print("No matches.")
 
 
+_INVOICE_MENU_PROMPT = "\nInvoice Menu\n1. Create Invoice from Hire\n2. Update Invoice Status\n3. List Invoices\n4. Search Invoices\n5. Invoice All Completed Hires\n0. Back\n"
+_INVOICE_MENU_OPTIONS = {
+    "1": create_invoice_from_hire,
+    "2": update_invoice_status,
+    "3": list_invoices,
+    "4": search_invoices,
+    "5": create_invoices_bulk,
+}
+
+
 def invoice_menu() -> None:
-    options = {
-        "1": create_invoice_from_hire,
-        "2": update_invoice_status,
-        "3": list_invoices,
-        "4": search_invoices,
-    }
     while True:
-        print("""\nInvoice Menu\n1. Create Invoice from Hire\n2. Update Invoice Status\n3. List Invoices\n4. Search Invoices\n0. Back""")
+        sys.stdout.write(_INVOICE_MENU_PROMPT)
         choice = input("Choose: ")
         if choice == "0":
             break
-        func = options.get(choice)
+        func = _INVOICE_MENU_OPTIONS.get(choice)
         if func:
             func()
         else:
@@ -719,13 +1155,14 @@ def update_supplier_payment_status() -> None:
 
 
 def list_supplier_payments() -> None:
-    rows = db.query(
+    found = False
+    for row in db.iter_query(
         """SELECT p.PaymentID, s.CompanyName, p.HireID, p.PaymentDate, p.Amount, p.PaymentStatus
             FROM tblSupplierPayment p JOIN tblSupplier s ON p.SupplierID = s.SupplierID"""
-    )
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    ):
+        found = True
+        print(row)
+    if not found:
         print("No payments found.")
 
 
@@ -735,32 +1172,37 @@ def search_supplier_payments() -> None:
     query = """SELECT p.PaymentID, s.CompanyName, p.HireID, p.Amount, p.PaymentStatus
                FROM tblSupplierPayment p JOIN tblSupplier s ON p.SupplierID=s.SupplierID WHERE 1=1"""
     params: list[Any] = []
-    if supplier:
-        query += " AND s.CompanyName LIKE ?"
-        params.append(f"%{supplier}%")
+    supplier_match = fts_prefix_query(supplier)
+    if supplier_match:
+        query += " AND p.SupplierID IN (SELECT rowid FROM tblSupplier_fts WHERE CompanyName MATCH ?)"
+        params.append(supplier_match)
     if status:
         query += " AND p.PaymentStatus LIKE ?"
         params.append(f"%{status}%")
-    rows = db.query(query, params)
-    for row in rows:
-        print(dict(row))
-    if not rows:
+    found = False
+    for row in db.iter_query(query, params):
+        found = True
+        print(row)
+    if not found:
         print("No matches.")
 
 
+_SUPPLIER_PAYMENT_MENU_PROMPT = "\nSupplier Payment Menu\n1. Add Supplier Payment\n2. Update Payment Status\n3. List Payments\n4. Search Payments\n0. Back\n"
+_SUPPLIER_PAYMENT_MENU_OPTIONS = {
+    "1": add_supplier_payment,
+    "2": update_supplier_payment_status,
+    "3": list_supplier_payments,
+    "4": search_supplier_payments,
+}
+
+
 def supplier_payment_menu() -> None:
-    options = {
-        "1": add_supplier_payment,
-        "2": update_supplier_payment_status,
-        "3": list_supplier_payments,
-        "4": search_supplier_payments,
-    }
     while True:
-        print("""\nSupplier Payment Menu\n1. Add Supplier Payment\n2. Update Payment Status\n3. List Payments\n4. Search Payments\n0. Back""")
+        sys.stdout.write(_SUPPLIER_PAYMENT_MENU_PROMPT)
         choice = input("Choose: ")
         if choice == "0":
             break
-        func = options.get(choice)
+        func = _SUPPLIER_PAYMENT_MENU_OPTIONS.get(choice)
         if func:
             func()
         else:
@@ -769,24 +1211,25 @@ def supplier_payment_menu() -> None:
 
 # ----------------------------- Main menu -----------------------------
 
+_MAIN_MENU_PROMPT = "\nRental Fleet Management\n1. Manage Fleet\n2. Manage Drivers\n3. Manage Suppliers\n4. Manage Customers\n5. Manage Hire Records\n6. Manage Customer Invoices\n7. Manage Supplier Payments\n0. Exit\n"
+_MAIN_MENU_OPTIONS = {
+    "1": fleet_menu,
+    "2": driver_menu,
+    "3": supplier_menu,
+    "4": customer_menu,
+    "5": hire_menu,
+    "6": invoice_menu,
+    "7": supplier_payment_menu,
+}
+
+
 def main_menu() -> None:
-    options = {
-        "1": fleet_menu,
-        "2": driver_menu,
-        "3": supplier_menu,
-        "4": customer_menu,
-        "5": hire_menu,
-        "6": invoice_menu,
-        "7": supplier_payment_menu,
-    }
     while True:
-        print(
-            """\nRental Fleet Management\n1. Manage Fleet\n2. Manage Drivers\n3. Manage Suppliers\n4. Manage Customers\n5. Manage Hire Records\n6. Manage Customer Invoices\n7. Manage Supplier Payments\n0. Exit"""
-        )
+        sys.stdout.write(_MAIN_MENU_PROMPT)
         choice = input("Select an option: ")
         if choice == "0":
             break
-        func = options.get(choice)
+        func = _MAIN_MENU_OPTIONS.get(choice)
         if func:
             func()
         else: